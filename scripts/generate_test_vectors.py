@@ -8,53 +8,143 @@ This script simulates the "perfect" behavior of each chip and generates:
 
 Usage: python generate_test_vectors.py [level_file.json ...]
        If no files specified, processes all levels/*.json files.
+
+Only the standard library is required (orjson is used for very large batches
+if installed), so the script also runs unchanged under PyPy:
+pypy3 generate_test_vectors.py
 """
 
+import functools
+import hashlib
 import json
 import sys
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional
+
+
+# =============================================================================
+# Bit Packing Helpers
+# Waveforms are packed into a single int with tick t stored in bit t, so
+# combinational logic runs as a handful of word-level bitwise ops.
+# =============================================================================
+
+@functools.lru_cache(maxsize=8)
+def repeat_bits(pattern: int, period: int, n_ticks: int) -> int:
+    """Repeat a period-bit pattern until it covers n_ticks bits
+
+    Cached: the fixed clock patterns only depend on n_ticks, which is the
+    same for nearly every level.
+    """
+    width = period
+    while width < n_ticks:
+        pattern |= pattern << width
+        width *= 2
+    return pattern & ((1 << n_ticks) - 1)
+
+
+# Maps b'1' to itself and every other byte to b'0'
+_BIT_DIGITS = bytes(c if c == ord('1') else ord('0') for c in range(256))
+
+
+def parse_waveform(values_str: str) -> int:
+    """Parse a waveform string into a packed bitmask ('1' -> 1, anything else -> 0)"""
+    digits = values_str.encode('ascii').translate(_BIT_DIGITS)
+    return int(digits[::-1], 2) if digits else 0
+
+
+def format_waveform(mask: int, n_ticks: int) -> str:
+    """Format the low n_ticks bits of a packed waveform as a '0'/'1' string"""
+    # A sentinel bit above the waveform keeps leading zeros; [:0:-1] drops it
+    return format((mask & ((1 << n_ticks) - 1)) | (1 << n_ticks), 'b')[:0:-1]
+
+
+def rising_edges(clk: int) -> int:
+    """Bitmask of ticks where a packed clock goes 0 -> 1 (clock starts low)"""
+    return clk & ~(clk << 1)
+
+
+def decode_select(s0: int, s1: int, n_ticks: int) -> tuple[int, int, int, int]:
+    """Decode two packed select lines into one-hot masks for S = 0, 1, 2, 3"""
+    mask = (1 << n_ticks) - 1
+    n0, n1 = ~s0 & mask, ~s1 & mask
+    return n1 & n0, n1 & s0, s1 & n0, s1 & s0
+
+
+def hold(values: int, events: int, n_ticks: int) -> int:
+    """Sample values on each event tick and hold it until the next event.
+
+    Ticks before the first event read 0. Runs as a log-step prefix scan, so
+    the cost is O(log n_ticks) bitwise ops regardless of how many events fire.
+    """
+    held = values & events
+    known = events
+    shift = 1
+    while shift < n_ticks:
+        held |= (held << shift) & ~known
+        known |= known << shift
+        shift <<= 1
+    return held & ((1 << n_ticks) - 1)
+
+
+def edge_segments(events: int, n_ticks: int):
+    """Walk the set bits of an event bitmask in tick order.
+
+    Yields (tick, span) pairs where span is a bitmask covering that tick up to
+    (but not including) the next event, or the end of the waveform.
+    """
+    end = 1 << n_ticks
+    while events:
+        low = events & -events
+        events ^= low
+        yield low.bit_length() - 1, (events & -events or end) - low
 
 
 # =============================================================================
 # Simulation Functions
 # Each function takes input waveforms dict and returns output waveforms dict
-# Keys are pin names, values are lists of 0/1 values
+# Keys are pin names, values are packed waveforms (tick t -> bit t)
 # =============================================================================
 
 def sim_cx04(inputs: dict, n_ticks: int) -> dict:
     """CX04: Four inverters - ~A, ~B, ~C, ~D"""
+    mask = (1 << n_ticks) - 1
+    a, b, c, d = (inputs[k] for k in ('A', 'B', 'C', 'D'))
     return {
-        '~A': [1 - inputs['A'][t] for t in range(n_ticks)],
-        '~B': [1 - inputs['B'][t] for t in range(n_ticks)],
-        '~C': [1 - inputs['C'][t] for t in range(n_ticks)],
-        '~D': [1 - inputs['D'][t] for t in range(n_ticks)],
+        '~A': ~a & mask,
+        '~B': ~b & mask,
+        '~C': ~c & mask,
+        '~D': ~d & mask,
     }
 
 
 def sim_cx08(inputs: dict, n_ticks: int) -> dict:
     """CX08: Four-input AND/OR gates"""
+    a, b, c, d = (inputs[k] for k in ('A', 'B', 'C', 'D'))
     return {
-        'Y0': [inputs['A'][t] & inputs['B'][t] & inputs['C'][t] & inputs['D'][t] for t in range(n_ticks)],
-        'Y1': [inputs['A'][t] | inputs['B'][t] | inputs['C'][t] | inputs['D'][t] for t in range(n_ticks)],
+        'Y0': a & b & c & d,
+        'Y1': a | b | c | d,
     }
 
 
 def sim_cx02(inputs: dict, n_ticks: int) -> dict:
     """CX02: Three NOR gates"""
+    mask = (1 << n_ticks) - 1
+    a, b, c, d, e, f = (inputs[k] for k in ('A', 'B', 'C', 'D', 'E', 'F'))
     return {
-        'Y0': [1 - (inputs['A'][t] | inputs['B'][t]) for t in range(n_ticks)],
-        'Y1': [1 - (inputs['C'][t] | inputs['D'][t]) for t in range(n_ticks)],
-        'Y2': [1 - (inputs['E'][t] | inputs['F'][t]) for t in range(n_ticks)],
+        'Y0': ~(a | b) & mask,
+        'Y1': ~(c | d) & mask,
+        'Y2': ~(e | f) & mask,
     }
 
 
 def sim_cx00(inputs: dict, n_ticks: int) -> dict:
     """CX00: Three NAND gates"""
+    mask = (1 << n_ticks) - 1
+    a, b, c, d, e, f = (inputs[k] for k in ('A', 'B', 'C', 'D', 'E', 'F'))
     return {
-        'Y0': [1 - (inputs['A'][t] & inputs['B'][t]) for t in range(n_ticks)],
-        'Y1': [1 - (inputs['C'][t] & inputs['D'][t]) for t in range(n_ticks)],
-        'Y2': [1 - (inputs['E'][t] & inputs['F'][t]) for t in range(n_ticks)],
+        'Y0': ~(a & b) & mask,
+        'Y1': ~(c & d) & mask,
+        'Y2': ~(e & f) & mask,
     }
 
 
@@ -64,7 +154,7 @@ def sim_cxr01(inputs: dict, n_ticks: int) -> dict:
     """
     reset_period = 4
     return {
-        '~R': [1 if t < reset_period else 0 for t in range(n_ticks)],
+        '~R': (1 << min(reset_period, n_ticks)) - 1,
     }
 
 
@@ -74,20 +164,13 @@ def sim_cx279(inputs: dict, n_ticks: int) -> dict:
     S=0, R=1 -> Q=0
     S=0, R=0 -> memory (hold)
     """
-    q = [0] * n_ticks
-    state = 0  # Initial state
-    for t in range(n_ticks):
-        s = inputs['S'][t]
-        r = inputs['R'][t]
-        if s and not r:
-            state = 1
-        elif r and not s:
-            state = 0
-        # else: hold state
-        q[t] = state
+    mask = (1 << n_ticks) - 1
+    s, r = inputs['S'], inputs['R']
+    # Q latches S on every set/reset tick, initial state 0
+    q = hold(s, s ^ r, n_ticks)
     return {
         'Q': q,
-        '~Q': [1 - q[t] for t in range(n_ticks)],
+        '~Q': ~q & mask,
     }
 
 
@@ -96,21 +179,12 @@ def sim_cx279e(inputs: dict, n_ticks: int) -> dict:
     When E=1, behaves like RS flip-flop
     When E=0, holds state
     """
-    q = [0] * n_ticks
-    state = 0
-    for t in range(n_ticks):
-        e = inputs['E'][t]
-        s = inputs['S'][t]
-        r = inputs['R'][t]
-        if e:
-            if s and not r:
-                state = 1
-            elif r and not s:
-                state = 0
-        q[t] = state
+    mask = (1 << n_ticks) - 1
+    e, s, r = inputs['E'], inputs['S'], inputs['R']
+    q = hold(s, e & (s ^ r), n_ticks)
     return {
         'Q': q,
-        '~Q': [1 - q[t] for t in range(n_ticks)],
+        '~Q': ~q & mask,
     }
 
 
@@ -120,8 +194,8 @@ def sim_cx556(inputs: dict, n_ticks: int) -> dict:
     CL2: period 8 ticks (4 high, 4 low), starting high
     """
     return {
-        'CL1': [1 - (t // 2) % 2 for t in range(n_ticks)],
-        'CL2': [1 - (t // 4) % 2 for t in range(n_ticks)],
+        'CL1': repeat_bits(0b0011, 4, n_ticks),
+        'CL2': repeat_bits(0b00001111, 8, n_ticks),
     }
 
 
@@ -129,20 +203,11 @@ def sim_cx74(inputs: dict, n_ticks: int) -> dict:
     """CX74: D flip-flop (positive edge triggered)
     On rising edge of CLK, Q takes value of D
     """
-    q = [0] * n_ticks
-    state = 0
-    prev_clk = 0
-    for t in range(n_ticks):
-        clk = inputs['CLK'][t]
-        d = inputs['D'][t]
-        # Rising edge detection
-        if clk and not prev_clk:
-            state = d
-        q[t] = state
-        prev_clk = clk
+    mask = (1 << n_ticks) - 1
+    q = hold(inputs['D'], rising_edges(inputs['CLK']), n_ticks)
     return {
         'Q': q,
-        '~Q': [1 - q[t] for t in range(n_ticks)],
+        '~Q': ~q & mask,
     }
 
 
@@ -151,16 +216,11 @@ def sim_cxf02(inputs: dict, n_ticks: int) -> dict:
     S=0: Y = CLK (passthrough)
     S=1: Y = CLK XOR CLK_delayed_by_2 (doubles frequency with 50% duty cycle)
     """
-    y = [0] * n_ticks
-    for t in range(n_ticks):
-        clk = inputs['CLK'][t]
-        s = inputs['S'][t]
-        if not s:
-            y[t] = clk
-        else:
-            # XOR with 2-tick delayed version for period 4 output
-            delayed_clk = inputs['CLK'][t-2] if t >= 2 else 0
-            y[t] = clk ^ delayed_clk
+    mask = (1 << n_ticks) - 1
+    clk, s = inputs['CLK'], inputs['S']
+    # XOR with 2-tick delayed version for period 4 output
+    delayed_clk = (clk << 2) & mask
+    y = (clk & ~s) | ((clk ^ delayed_clk) & s)
     return {'Y': y}
 
 
@@ -169,18 +229,9 @@ def sim_cx139(inputs: dict, n_ticks: int) -> dict:
     E=0: all outputs 0
     E=1: output selected by (A1,A0) is 1
     """
-    y0, y1, y2, y3 = [0] * n_ticks, [0] * n_ticks, [0] * n_ticks, [0] * n_ticks
-    for t in range(n_ticks):
-        e = inputs['E'][t]
-        a0 = inputs['A0'][t]
-        a1 = inputs['A1'][t]
-        if e:
-            addr = a1 * 2 + a0
-            if addr == 0: y0[t] = 1
-            elif addr == 1: y1[t] = 1
-            elif addr == 2: y2[t] = 1
-            elif addr == 3: y3[t] = 1
-    return {'Y0': y0, 'Y1': y1, 'Y2': y2, 'Y3': y3}
+    e = inputs['E']
+    sel = decode_select(inputs['A0'], inputs['A1'], n_ticks)
+    return {'Y0': e & sel[0], 'Y1': e & sel[1], 'Y2': e & sel[2], 'Y3': e & sel[3]}
 
 
 def sim_cx83(inputs: dict, n_ticks: int) -> dict:
@@ -188,31 +239,23 @@ def sim_cx83(inputs: dict, n_ticks: int) -> dict:
     {CO, S1, S0} = A + B + CI
     where A = (A1, A0), B = (B1, B0)
     """
-    s0, s1, co = [0] * n_ticks, [0] * n_ticks, [0] * n_ticks
-    for t in range(n_ticks):
-        a = inputs['A1'][t] * 2 + inputs['A0'][t]
-        b = inputs['B1'][t] * 2 + inputs['B0'][t]
-        ci = inputs['CI'][t]
-        result = a + b + ci
-        s0[t] = result & 1
-        s1[t] = (result >> 1) & 1
-        co[t] = (result >> 2) & 1
-    return {'S0': s0, 'S1': s1, 'CO': co}
+    a0, a1, b0, b1, ci = inputs['A0'], inputs['A1'], inputs['B0'], inputs['B1'], inputs['CI']
+    # Two ripple-carry full adder stages, evaluated for every tick at once
+    p0, p1 = a0 ^ b0, a1 ^ b1
+    c1 = (a0 & b0) | (ci & p0)
+    return {'S0': p0 ^ ci, 'S1': p1 ^ c1, 'CO': (a1 & b1) | (c1 & p1)}
 
 
 def sim_cx93(inputs: dict, n_ticks: int) -> dict:
     """CX93: Divide by 4 counter
     Output toggles every 2 rising edges of CLK
     """
-    y = [0] * n_ticks
+    y = 0
     count = 0
-    prev_clk = 0
-    for t in range(n_ticks):
-        clk = inputs['CLK'][t]
-        if clk and not prev_clk:  # Rising edge
-            count = (count + 1) % 4
-        y[t] = 1 if count >= 2 else 0
-        prev_clk = clk
+    for _, span in edge_segments(rising_edges(inputs['CLK']), n_ticks):
+        count = (count + 1) % 4
+        if count >= 2:
+            y |= span
     return {'Y': y}
 
 
@@ -220,13 +263,8 @@ def sim_cx153(inputs: dict, n_ticks: int) -> dict:
     """CX153: 4-to-1 multiplexer
     Y = D[S] where S = (S1, S0)
     """
-    y = [0] * n_ticks
-    for t in range(n_ticks):
-        s = inputs['S1'][t] * 2 + inputs['S0'][t]
-        if s == 0: y[t] = inputs['D0'][t]
-        elif s == 1: y[t] = inputs['D1'][t]
-        elif s == 2: y[t] = inputs['D2'][t]
-        else: y[t] = inputs['D3'][t]
+    sel = decode_select(inputs['S0'], inputs['S1'], n_ticks)
+    y = (inputs['D0'] & sel[0]) | (inputs['D1'] & sel[1]) | (inputs['D2'] & sel[2]) | (inputs['D3'] & sel[3])
     return {'Y': y}
 
 
@@ -236,23 +274,18 @@ def sim_cx161(inputs: dict, n_ticks: int) -> dict:
       CLR=1: Q = 0
       CLR=0: Q = Q + 1
     """
-    q0, q1, q2, q3 = [0] * n_ticks, [0] * n_ticks, [0] * n_ticks, [0] * n_ticks
+    clk, clr = inputs['CLK'], inputs['CLR']
+    q = [0, 0, 0, 0]  # Q0, Q1, Q2, Q3
     count = 0
-    prev_clk = 0
-    for t in range(n_ticks):
-        clk = inputs['CLK'][t]
-        clr = inputs['CLR'][t]
-        if clk and not prev_clk:  # Rising edge
-            if clr:
-                count = 0
-            else:
-                count = (count + 1) % 16
-        q0[t] = count & 1
-        q1[t] = (count >> 1) & 1
-        q2[t] = (count >> 2) & 1
-        q3[t] = (count >> 3) & 1
-        prev_clk = clk
-    return {'Q0': q0, 'Q1': q1, 'Q2': q2, 'Q3': q3}
+    for t, span in edge_segments(rising_edges(clk), n_ticks):
+        if (clr >> t) & 1:
+            count = 0
+        else:
+            count = (count + 1) % 16
+        for bit in range(4):
+            if (count >> bit) & 1:
+                q[bit] |= span
+    return {'Q0': q[0], 'Q1': q[1], 'Q2': q[2], 'Q3': q[3]}
 
 
 def sim_cx195(inputs: dict, n_ticks: int) -> dict:
@@ -260,16 +293,13 @@ def sim_cx195(inputs: dict, n_ticks: int) -> dict:
     On rising edge of CLK:
       DIN -> Q0 -> Q1 -> Q2 -> Q3
     """
-    q0, q1, q2, q3 = [0] * n_ticks, [0] * n_ticks, [0] * n_ticks, [0] * n_ticks
-    reg = [0, 0, 0, 0]  # Q0, Q1, Q2, Q3
-    prev_clk = 0
-    for t in range(n_ticks):
-        clk = inputs['CLK'][t]
-        din = inputs['DIN'][t]
-        if clk and not prev_clk:  # Rising edge
-            reg = [din, reg[0], reg[1], reg[2]]
-        q0[t], q1[t], q2[t], q3[t] = reg
-        prev_clk = clk
+    rise = rising_edges(inputs['CLK'])
+    # Each stage latches the previous stage's value from the tick before the
+    # edge, i.e. the previous stage delayed by one tick
+    q0 = hold(inputs['DIN'], rise, n_ticks)
+    q1 = hold(q0 << 1, rise, n_ticks)
+    q2 = hold(q1 << 1, rise, n_ticks)
+    q3 = hold(q2 << 1, rise, n_ticks)
     return {'Q0': q0, 'Q1': q1, 'Q2': q2, 'Q3': q3}
 
 
@@ -279,17 +309,20 @@ def sim_cx6116(inputs: dict, n_ticks: int) -> dict:
     WE=0, RE=1: Read from address to D_out
     D_in is the input waveform, D_out is what we compute
     """
-    d_out = [0] * n_ticks
-    memory = [0] * 8  # 8 cells
-    for t in range(n_ticks):
-        addr = inputs['A2'][t] * 4 + inputs['A1'][t] * 2 + inputs['A0'][t]
-        we = inputs['WE'][t]
-        re = inputs['RE'][t]
-        d_in = inputs['D_in'][t]  # Use D_in for write data
-        if we and not re:
-            memory[addr] = d_in
-        if re and not we:
-            d_out[t] = memory[addr]
+    mask = (1 << n_ticks) - 1
+    a0, a1, a2 = inputs['A0'], inputs['A1'], inputs['A2']
+    we, re = inputs['WE'], inputs['RE']
+    d_in = inputs['D_in']  # Use D_in for write data
+    writes, reads = we & ~re, re & ~we
+    # Address lines and their complements, indexed by bit value
+    lines = [(~a & mask, a) for a in (a0, a1, a2)]
+    d_out = 0
+    # Each of the 8 cells is an independent latch: it holds D_in from the
+    # last write that selected it, and drives D_out on reads that select it
+    for addr in range(8):
+        selected = lines[0][addr & 1] & lines[1][(addr >> 1) & 1] & lines[2][addr >> 2]
+        cell = hold(d_in, writes & selected, n_ticks)
+        d_out |= cell & reads & selected
     return {'D_out': d_out}
 
 
@@ -302,25 +335,17 @@ def sim_cx181(inputs: dict, n_ticks: int) -> dict:
     1  1  | Y = A XOR B
     Z = 1 when Y = 00
     """
-    y0, y1, z = [0] * n_ticks, [0] * n_ticks, [0] * n_ticks
-    for t in range(n_ticks):
-        a = inputs['A1'][t] * 2 + inputs['A0'][t]
-        b = inputs['B1'][t] * 2 + inputs['B0'][t]
-        f = inputs['F1'][t] * 2 + inputs['F0'][t]
-
-        if f == 0:  # AND
-            result = a & b
-        elif f == 1:  # OR
-            result = a | b
-        elif f == 2:  # NOT A
-            result = (~a) & 3  # 2-bit NOT
-        else:  # XOR
-            result = a ^ b
-
-        y0[t] = result & 1
-        y1[t] = (result >> 1) & 1
-        z[t] = 1 if result == 0 else 0
-    return {'Y0': y0, 'Y1': y1, 'Z': z}
+    mask = (1 << n_ticks) - 1
+    a0, a1, b0, b1 = inputs['A0'], inputs['A1'], inputs['B0'], inputs['B1']
+    f_and, f_or, f_not, f_xor = decode_select(inputs['F0'], inputs['F1'], n_ticks)
+
+    # Every operation is bitwise, so each result bit only depends on the
+    # matching A/B bits; pick the active operation per tick with its mask
+    def op(a, b):
+        return (f_and & a & b) | (f_or & (a | b)) | (f_not & ~a) | (f_xor & (a ^ b))
+
+    y0, y1 = op(a0, b0) & mask, op(a1, b1) & mask
+    return {'Y0': y0, 'Y1': y1, 'Z': ~(y0 | y1) & mask}
 
 
 # =============================================================================
@@ -454,57 +479,155 @@ LEVEL_CONFIG = {
     },
 }
 
+# Reverse maps (pin_index -> signal_name) are pure functions of the config,
+# so build them once here instead of on every level file.
+for _cfg in LEVEL_CONFIG.values():
+    _pin_map = _cfg.get('pin_map', {})
+    _cfg['_idx_to_input'] = {_pin_map[sig]: sig for sig in _cfg.get('inputs', []) if sig in _pin_map}
+    _cfg['_idx_to_output'] = {_pin_map[sig]: sig for sig in _cfg.get('outputs', []) if sig in _pin_map}
+
+
+# Renders a formatted bitmask as a test vector: 0 -> '?', 1 -> 'x'
+_TEST_CHARS = str.maketrans('01', '?x')
+
 
-def generate_test_vector(values: list[int], stability_ticks: int = 1, warmup_ticks: int = 0) -> str:
+def generate_test_vector(values: int, n_ticks: int, stability_ticks: int = 1, warmup_ticks: int = 0) -> str:
     """Generate test vector with 'x' for ticks after transitions.
 
     Args:
-        values: Output values (list of 0/1)
+        values: Output values (packed waveform, tick t -> bit t)
+        n_ticks: Number of ticks in the waveform
         stability_ticks: Number of ticks after a transition to mark as don't care
         warmup_ticks: Number of ticks at the start to mark as don't care
     """
-    test = ['?'] * len(values)
+    mask = (1 << n_ticks) - 1
 
     # Mark warmup ticks as don't care
-    for i in range(min(warmup_ticks, len(values))):
-        test[i] = 'x'
+    dont_care = (1 << min(warmup_ticks, n_ticks)) - 1
+
+    # Ticks whose value differs from the previous tick (tick 0 never counts)
+    transitions = (values ^ (values << 1)) & mask & ~1
+
+    # Mark each transition tick and the next (stability_ticks - 1) ticks as don't care
+    for j in range(stability_ticks):
+        dont_care |= transitions << j
+
+    return format_waveform(dont_care, n_ticks).translate(_TEST_CHARS)
+
+
+def render_output(values: int, n_ticks: int, stability_ticks: int = 1, warmup_ticks: int = 0) -> tuple[str, str]:
+    """Render a packed output waveform as its (values, test) strings in one step."""
+    return format_waveform(values, n_ticks), generate_test_vector(values, n_ticks, stability_ticks, warmup_ticks)
+
 
-    # Mark ticks after transitions as don't care
-    for i in range(1, len(values)):
-        if values[i] != values[i-1]:
-            # Mark this tick and the next (stability_ticks - 1) ticks as don't care
-            for j in range(stability_ticks):
-                if i + j < len(values):
-                    test[i + j] = 'x'
+# Importing orjson takes ~10 ms and saves ~0.02 ms per level file over stdlib
+# json, so it's only used for batches at least this large
+ORJSON_MIN_FILES = 512
 
-    return ''.join(test)
+
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """Return the orjson module if installed, else None (imported on first use)."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
 
 
-def process_level(level_path: Path, dry_run: bool = False) -> bool:
-    """Process a single level file."""
+def load_level(level_path: Path, fast_json: bool = False) -> dict:
+    """Read a level JSON file, using orjson if fast_json is set and it's installed."""
+    orjson = _orjson() if fast_json else None
+    if orjson is not None:
+        return orjson.loads(level_path.read_bytes())
     with open(level_path, 'r') as f:
-        data = json.load(f)
+        return json.load(f)
+
+
+def save_level(level_path: Path, data: dict, fast_json: bool = False) -> None:
+    """Write a level JSON file with 2-space indent and a trailing newline."""
+    orjson = _orjson() if fast_json else None
+    if orjson is not None:
+        level_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with open(level_path, 'w') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+# =============================================================================
+# Result Cache (opt-in via --cache)
+# Maps a hash of (script, level, input waveforms) to the rendered outputs, so
+# levels whose inputs haven't changed can skip simulation on the next run.
+# Simulating the shipped levels takes about a millisecond, which is less than
+# loading and saving the cache, so it's only worth enabling for slow sims or
+# much larger level sets.
+# =============================================================================
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'testvec.json'
+
+
+@functools.lru_cache(maxsize=None)
+def _script_hash() -> str:
+    """Hash of this file; editing the simulations must invalidate old entries."""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+
+
+def cache_key(level_name: str, input_strs: dict, config: dict) -> str:
+    """Hash everything that determines a level's outputs."""
+    blob = json.dumps({
+        'script': _script_hash(),
+        'lvl': level_name,
+        'stability_ticks': config.get('stability_ticks', 1),
+        'warmup_ticks': config.get('warmup_ticks', 0),
+        'in': input_strs,
+    }, sort_keys=True)
+    return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+
+def load_cache() -> dict:
+    """Load the result cache, treating a missing or unreadable file as empty."""
+    try:
+        with open(CACHE_PATH, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(cache: dict) -> None:
+    """Write the result cache, creating .cache/ if needed."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, 'w') as f:
+        json.dump(cache, f)
+
+
+def process_level(level_path: Path, dry_run: bool = False, cache: Optional[dict] = None,
+                  fast_json: bool = False) -> tuple[bool, list[tuple[str, bool]], dict]:
+    """Process a single level file.
+
+    Returns whether the level was modified, the report lines to print as
+    (line, to_stderr) pairs, and the result cache entries this level used or
+    produced. Lines are returned rather than printed so parallel workers don't
+    interleave.
+    """
+    report = []
+    data = load_level(level_path, fast_json)
 
     level_name = data.get('name', '')
     config = LEVEL_CONFIG.get(level_name)
 
     if not config:
-        print(f"  {level_path.name}: No config for {level_name}, skipping")
-        return False
+        report.append((f"  {level_path.name}: No config for {level_name}, skipping", False))
+        return False, report, {}
 
-    # Build pin_index -> name mapping from level's pins array
+    # Pin names from the level, used when the config has no mapping for a pin
     pins = data.get('pins', [])
-    pin_map = config.get('pin_map', {})
-
-    # Build reverse map: pin_index -> signal_name for inputs
-    input_signals = config.get('inputs', [])
-    idx_to_input = {}
-    for sig in input_signals:
-        if sig in pin_map:
-            idx_to_input[pin_map[sig]] = sig
+    idx_to_input = config['_idx_to_input']
 
     # Get input waveforms
     inputs = {}
+    input_strs = {}
     n_ticks = 64
 
     for wf in data.get('waveforms', []):
@@ -522,31 +645,12 @@ def process_level(level_path: Path, dry_run: bool = False) -> bool:
 
         values_str = wf.get('values', '')
         n_ticks = len(values_str)
-        values = [1 if c == '1' else 0 for c in values_str]
-        inputs[sig_name] = values
-
-    # Run simulation
-    try:
-        outputs = config['sim'](inputs, n_ticks)
-    except Exception as e:
-        print(f"  {level_path.name}: Simulation error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-    # Build reverse map for outputs: pin_index -> signal_name
-    output_signals = config.get('outputs', [])
-    idx_to_output = {}
-    for sig in output_signals:
-        if sig in pin_map:
-            idx_to_output[pin_map[sig]] = sig
+        inputs[sig_name] = parse_waveform(values_str)
+        input_strs[sig_name] = values_str
 
-    # Get test vector parameters
-    stability_ticks = config.get('stability_ticks', 1)
-    warmup_ticks = config.get('warmup_ticks', 0)
-
-    # Update output waveforms
-    modified = False
+    # Find output waveforms and their signal names
+    idx_to_output = config['_idx_to_output']
+    output_wfs = []
     for wf in data.get('waveforms', []):
         if wf.get('is_input', True):
             continue
@@ -559,32 +663,91 @@ def process_level(level_path: Path, dry_run: bool = False) -> bool:
             # Fall back to pin name
             out_name = pins[pin_idx] if pin_idx < len(pins) else None
 
+        output_wfs.append((wf, out_name))
+
+    # Skip simulation if the cached outputs for these inputs are already on
+    # disk; every simulated output waveform must have a matching entry, and
+    # malformed entries count as a miss
+    key = cache_key(level_name, input_strs, config) if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    if isinstance(cached, dict) and all(
+        cached.get(out_name) == [wf.get('values', ''), wf.get('test', '')]
+        for wf, out_name in output_wfs if out_name in config['outputs']
+    ):
+        return False, report, {key: cached}
+
+    # Run simulation
+    try:
+        outputs = config['sim'](inputs, n_ticks)
+    except Exception as e:
+        report.append((f"  {level_path.name}: Simulation error: {e}", False))
+        import traceback
+        report.append((traceback.format_exc().rstrip(), True))
+        return False, report, {}
+
+    # Get test vector parameters
+    stability_ticks = config.get('stability_ticks', 1)
+    warmup_ticks = config.get('warmup_ticks', 0)
+
+    # Update output waveforms
+    modified = False
+    rendered = {}
+    for wf, out_name in output_wfs:
         if out_name not in outputs:
             continue
 
-        new_values = outputs[out_name]
-        new_values_str = ''.join(str(v) for v in new_values)
-        new_test = generate_test_vector(new_values, stability_ticks, warmup_ticks)
+        pin_idx = wf.get('pin_index')
+        new_values_str, new_test = render_output(outputs[out_name], n_ticks, stability_ticks, warmup_ticks)
+        rendered[out_name] = [new_values_str, new_test]
 
         old_values = wf.get('values', '')
         old_test = wf.get('test', '')
 
         if old_values != new_values_str or old_test != new_test:
-            print(f"  {level_path.name}: {out_name} (pin {pin_idx})")
-            print(f"    old: {old_values[:50]}{'...' if len(old_values) > 50 else ''}")
-            print(f"    new: {new_values_str[:50]}{'...' if len(new_values_str) > 50 else ''}")
-            print(f"    tst: {new_test[:50]}{'...' if len(new_test) > 50 else ''}")
+            report.append((f"  {level_path.name}: {out_name} (pin {pin_idx})", False))
+            report.append((f"    old: {old_values[:50]}{'...' if len(old_values) > 50 else ''}", False))
+            report.append((f"    new: {new_values_str[:50]}{'...' if len(new_values_str) > 50 else ''}", False))
+            report.append((f"    tst: {new_test[:50]}{'...' if len(new_test) > 50 else ''}", False))
 
             wf['values'] = new_values_str
             wf['test'] = new_test
             modified = True
 
     if modified and not dry_run:
-        with open(level_path, 'w') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write('\n')
+        save_level(level_path, data, fast_json)
+
+    return modified, report, ({key: rendered} if key is not None else {})
 
-    return modified
+
+# Result cache for pool workers, installed once per process by the initializer
+# rather than pickled into every task
+_worker_cache: Optional[dict] = None
+
+
+def _init_worker(cache: Optional[dict]) -> None:
+    """Pool initializer: store the result cache for this worker process."""
+    global _worker_cache
+    _worker_cache = cache
+
+
+def _process_level_in_worker(level_path: Path, dry_run: bool,
+                             fast_json: bool) -> tuple[bool, list[tuple[str, bool]], dict]:
+    """Pool task: process_level using the worker's result cache."""
+    return process_level(level_path, dry_run, _worker_cache, fast_json)
+
+
+# Starting worker processes costs far more than simulating a level, so only
+# fan out by default for batches much larger than the shipped levels/
+PARALLEL_MIN_FILES = 64
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    n = int(value)
+    if n < 1:
+        import argparse
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return n
 
 
 def main():
@@ -592,6 +755,11 @@ def main():
     parser = argparse.ArgumentParser(description='Generate test vectors for CXEMA levels')
     parser.add_argument('files', nargs='*', help='Level JSON files (default: all in levels/)')
     parser.add_argument('--dry-run', '-n', action='store_true', help='Show changes without writing')
+    parser.add_argument('--jobs', '-j', type=positive_int, default=None,
+                        help=f'Worker processes (default: serial, or one per CPU for '
+                             f'{PARALLEL_MIN_FILES}+ files)')
+    parser.add_argument('--cache', action='store_true',
+                        help=f'Reuse and update the result cache ({CACHE_PATH.parent.name}/{CACHE_PATH.name})')
     args = parser.parse_args()
 
     if args.files:
@@ -610,10 +778,41 @@ def main():
         print("(dry run - no files will be modified)")
     print()
 
+    # Each level is independent, so large batches can fan out across processes;
+    # reports are printed in file order once they come back
+    cache = load_cache() if args.cache else None
+    fast_json = len(level_files) >= ORJSON_MIN_FILES
+    if args.jobs is None:
+        parallel = len(level_files) >= PARALLEL_MIN_FILES
+    else:
+        parallel = args.jobs > 1 and len(level_files) > 1
+    if parallel:
+        from concurrent.futures import ProcessPoolExecutor
+        worker = functools.partial(_process_level_in_worker, dry_run=args.dry_run, fast_json=fast_json)
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                                 initargs=(cache,)) as pool:
+            results = list(pool.map(worker, level_files))
+    else:
+        results = [process_level(level_path, args.dry_run, cache, fast_json) for level_path in level_files]
+
     modified_count = 0
-    for level_path in level_files:
-        if process_level(level_path, args.dry_run):
+    used_cache = {}
+    for modified, report, cache_update in results:
+        for line, to_stderr in report:
+            print(line, file=sys.stderr if to_stderr else sys.stdout)
+        if modified:
             modified_count += 1
+        used_cache.update(cache_update)
+
+    # A full run touches every level, so keep only its entries and let stale
+    # keys (e.g. from older versions of this script) drop out. Runs on specific
+    # files merge into the existing cache instead. Dry runs write nothing.
+    if cache is not None and not args.dry_run:
+        if not args.files:
+            cache = used_cache
+        else:
+            cache.update(used_cache)
+        save_cache(cache)
 
     print(f"\n{'Would modify' if args.dry_run else 'Modified'} {modified_count} files.")
     return 0